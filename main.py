@@ -2,24 +2,30 @@
 Main orchestrator script for processing alerts and extracting video clips
 """
 import argparse
+import atexit
 import logging
+import logging.handlers
 import os
 import sys
+import time
 import uuid
 import json
+import operator
+import signal
 import threading
-import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timezone, timedelta
 from pathlib import Path
 from typing import List, Dict, Optional, Tuple
 
 import paho.mqtt.client as mqtt
+from botocore.config import Config as BotoConfig
 
 from src.core.api_client import APIClient
 from src.core.clip_extractor import ClipExtractor
 from src.core.s3_uploader import S3Uploader
 from src.core.email_sender import EmailSender
-from src.utils.logger_config import setup_logging, get_logger, PerformanceLogger
+from src.utils.logger_config import setup_logging, get_logger, ContextualLoggerAdapter, PerformanceLogger
 
 from src.utils.device_utils import get_device_id
 from src.utils.status_manager import read_status_file, write_status_file
@@ -27,9 +33,12 @@ from src.utils.aws_utils import setup_aws_credentials, check_aws_credentials
 from src.utils.config_manager import load_config, parse_config
 from src.utils.progress_utils import LoggingTqdm
 from src.utils.cleanup_utils import cleanup_recordings
-from src.core.alert_processor import process_alert
+from src.core.alert_processor import AlertResult, process_alert, parse_alert_date
 from src.tests.test_connectivity import run_connectivity_tests
 
+# Cached tz constant; mirrors the one in alert_processor
+_UTC = timezone.utc
+
 
 def setup_resume_logger(log_dir: str) -> logging.Logger:
     """Setup resume log file for progress bar updates"""
@@ -43,9 +52,19 @@ def setup_resume_logger(log_dir: str) -> logging.Logger:
         datefmt="%Y-%m-%d %H:%M:%S"
     )
     resume_log_handler.setFormatter(resume_log_formatter)
+    # Buffer progress lines so bursts of tqdm ticks coalesce into a few
+    # write() syscalls; errors and shutdown flush immediately
+    buffered_handler = logging.handlers.MemoryHandler(
+        capacity=512,
+        flushLevel=logging.ERROR,
+        target=resume_log_handler,
+        flushOnClose=True
+    )
+    buffered_handler.setLevel(logging.INFO)
+    atexit.register(buffered_handler.flush)
     resume_logger = logging.getLogger("resume")
     resume_logger.setLevel(logging.INFO)
-    resume_logger.addHandler(resume_log_handler)
+    resume_logger.addHandler(buffered_handler)
     resume_logger.propagate = False
     return resume_logger
 
@@ -53,24 +72,23 @@ def setup_resume_logger(log_dir: str) -> logging.Logger:
 def get_fetch_date(date_cursor: Optional[int]) -> str:
     """Calculate fetch date based on date cursor"""
     if date_cursor is not None:
-        current_date = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+        current_date = datetime.now(_UTC).replace(hour=0, minute=0, second=0, microsecond=0)
         target_date = current_date + timedelta(days=date_cursor)
         return target_date.strftime('%Y-%m-%d')
     else:
-        return datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0).strftime('%Y-%m-%d')
+        return datetime.now(_UTC).replace(hour=0, minute=0, second=0, microsecond=0).strftime('%Y-%m-%d')
 
 
 def initialize_email_sender(config, logger):
     """Initialize email sender if enabled"""
-    email_enabled = config.get("email_enabled", False)
-    if not email_enabled:
+    if not config.email_enabled:
         return None
     
     try:
         email_sender = EmailSender(
-            from_email=config["from_email"],
-            to_emails=config["to_emails"],
-            use_tls=config["use_tls"]
+            from_email=config.from_email,
+            to_emails=list(config.to_emails),
+            use_tls=config.use_tls
         )
         return email_sender
     except Exception as e:
@@ -103,12 +121,12 @@ def wait_for_broker_message(device_id: str, default_date: str, logger) -> Tuple[
     mqtt_topic = f"storeyes/{device_id}/alert-processing"
     
     logger.info(f"Waiting for message on topic: {mqtt_topic}")
-    
+
     # Variables to store the received message
     received_message = None
-    message_received = threading.Event()
     connection_error = None
-    
+    timed_out = False
+
     def on_connect(client, userdata, flags, reason_code, properties=None):
         """Callback for when the client receives a CONNACK response from the server"""
         if reason_code == 0:
@@ -121,44 +139,54 @@ def wait_for_broker_message(device_id: str, default_date: str, logger) -> Tuple[
             logger.error(error_msg)
             nonlocal connection_error
             connection_error = error_msg
-            message_received.set()
-    
+            client.disconnect()
+
     def on_message(client, userdata, msg):
         """Callback for when a PUBLISH message is received from the server"""
         try:
             payload_str = msg.payload.decode('utf-8')
             logger.info(f"Received message on topic {msg.topic}: {payload_str}")
-            
+
             # Parse JSON payload
             payload = json.loads(payload_str)
-            
+
             # Extract action and date
             action = payload.get("action")
             date = payload.get("date")
             date_provided = date is not None and date != ""
-            
+
             if action not in ["start", "abort"]:
                 logger.warning(f"Invalid action '{action}' in message. Expected 'start' or 'abort'")
                 return
-            
+
             nonlocal received_message
             received_message = {
                 "action": action,
                 "date": date if date_provided else default_date,
                 "date_provided": date_provided
             }
-            message_received.set()
-            
+            # Break out of loop_forever() in the main thread
+            client.disconnect()
+
         except json.JSONDecodeError as e:
             logger.error(f"Failed to parse JSON message: {e}")
         except Exception as e:
             logger.error(f"Error processing message: {e}", exc_info=True)
-    
+
     def on_disconnect(client, userdata, disconnect_flags, reason_code, properties=None):
         """Callback for when the client disconnects from the server (Callback API v2)"""
         if reason_code != 0:
             logger.warning(f"Unexpected MQTT disconnection (reason_code={reason_code}, flags={disconnect_flags})")
-    
+
+    def on_alarm(signum, frame):
+        """SIGALRM handler used to bound the blocking network loop"""
+        # Don't raise here: paho's _loop wraps select.select in a blanket
+        # except Exception and loop_forever would reconnect and keep going.
+        # disconnect() flips the client state so loop_forever returns cleanly.
+        nonlocal timed_out
+        timed_out = True
+        client.disconnect()
+
     try:
         # Create MQTT client (use latest callback API version to avoid deprecation warning)
         client = mqtt.Client(callback_api_version=mqtt.CallbackAPIVersion.VERSION2)
@@ -166,39 +194,43 @@ def wait_for_broker_message(device_id: str, default_date: str, logger) -> Tuple[
         client.on_connect = on_connect
         client.on_message = on_message
         client.on_disconnect = on_disconnect
-        
+
         # Connect to broker
         logger.info(f"Connecting to MQTT broker at {mqtt_host}:{mqtt_port}...")
         client.connect(mqtt_host, mqtt_port, keepalive=60)
-        
-        # Start network loop
-        client.loop_start()
-        
-        # Wait for message (with timeout of 1 hour)
+
+        # Run the network loop in this thread, bounded by SIGALRM (timeout of 1 hour).
+        # The process is single-threaded at this point, so the blocking loop avoids
+        # a background paho thread and the cross-thread Event signalling.
         timeout_seconds = 3600
-        if message_received.wait(timeout=timeout_seconds):
-            client.loop_stop()
-            client.disconnect()
-            
-            if connection_error:
-                logger.error(f"Connection error: {connection_error}")
-                return None, None, False
-            
-            if received_message:
-                action = received_message["action"]
-                date = received_message["date"]
-                date_provided = received_message.get("date_provided", False)
-                logger.info(f"Received action: {action}, date: {date}, date_provided: {date_provided}")
-                return action, date, date_provided
-            else:
-                logger.warning("Message received but payload was invalid")
-                return None, None, False
-        else:
+        old_handler = signal.signal(signal.SIGALRM, on_alarm)
+        signal.alarm(timeout_seconds)
+        try:
+            # on_connect (failure), on_message and on_alarm call
+            # client.disconnect() to break the loop
+            client.loop_forever()
+        finally:
+            signal.alarm(0)
+            signal.signal(signal.SIGALRM, old_handler)
+
+        if timed_out:
             logger.error(f"Timeout waiting for message after {timeout_seconds} seconds")
-            client.loop_stop()
-            client.disconnect()
             return None, None, False
-            
+
+        if connection_error:
+            logger.error(f"Connection error: {connection_error}")
+            return None, None, False
+
+        if received_message:
+            action = received_message["action"]
+            date = received_message["date"]
+            date_provided = received_message.get("date_provided", False)
+            logger.info(f"Received action: {action}, date: {date}, date_provided: {date_provided}")
+            return action, date, date_provided
+        else:
+            logger.warning("Message received but payload was invalid")
+            return None, None, False
+
     except Exception as e:
         logger.error(f"Error waiting for broker message: {e}", exc_info=True)
         return None, None, False
@@ -336,16 +368,27 @@ def main():
                 logger.info(f"No date in broker message, using default: {fetch_date}")
     
     # Replace {device-id} and {date} in the prefix
-    s3_upload_prefix = config["s3_upload_prefix_template"].replace("{device-id}", device_id).replace("{date}", fetch_date)
+    s3_upload_prefix = config.s3_upload_prefix_template.replace("{device-id}", device_id).replace("{date}", fetch_date)
     
     # api_client already created above for fetching global settings
     
     # Log workflow configuration
-    logger.info(f"Source: Loading video chunks from local directory '{config['local_source_dir']}'")
-    logger.info(f"Destination: Uploading processed clips to S3 bucket '{config['s3_bucket']}/{s3_upload_prefix}'")
-    
-    # Initialize S3 uploader
-    s3_uploader = S3Uploader(config["aws_region"], config["s3_bucket"], s3_upload_prefix)
+    logger.info(f"Source: Loading video chunks from local directory '{config.local_source_dir}'")
+    logger.info(f"Destination: Uploading processed clips to S3 bucket '{config.s3_bucket}/{s3_upload_prefix}'")
+    
+    # Initialize S3 uploader. Size the botocore connection pool to the worker
+    # concurrency so parallel uploads don't serialize on the default pool of 10.
+    # tcp_keepalive keeps idle pooled connections alive across long ffmpeg
+    # phases, so NAT/firewalls don't silently drop them and force a fresh
+    # TLS handshake on the next upload.
+    boto_config = BotoConfig(
+        max_pool_connections=max(50, config.max_workers * 4),
+        tcp_keepalive=True,
+        retries={"mode": "adaptive"},
+    )
+    s3_uploader = S3Uploader(config.aws_region, config.s3_bucket, s3_upload_prefix,
+                             boto_config=boto_config,
+                             multipart_concurrency=config.multipart_concurrency)
     
     # Run connectivity tests if --test flag is set
     if args.test:
@@ -359,12 +402,12 @@ def main():
         sys.exit(0 if success else 1)
     
     clip_extractor = ClipExtractor(
-        before_minutes=config["before_minutes"],
-        after_minutes=config["after_minutes"],
-        output_dir=config["output_dir"],
-        chunk_duration_seconds=config["chunk_duration_seconds"],
-        chunk_filename_pattern=config["chunk_filename_pattern"],
-        local_source_dir=config["local_source_dir"]
+        before_minutes=config.before_minutes,
+        after_minutes=config.after_minutes,
+        output_dir=config.output_dir,
+        chunk_duration_seconds=config.chunk_duration_seconds,
+        chunk_filename_pattern=config.chunk_filename_pattern,
+        local_source_dir=config.local_source_dir
     )
     
     # Initialize email sender if enabled
@@ -402,6 +445,14 @@ def main():
         logger.info(f"No alerts found for date {fetch_date}")
         write_status_file("EMPTY", board_id=device_id)
         sys.exit(0)
+
+    # Parse each alertDate once (memoized), decorate the alert dicts with the
+    # result and sort via a C-level key getter. process_alert reuses the
+    # cached parse for its S3 timestamp.
+    epoch = datetime.min.replace(tzinfo=_UTC)
+    for alert in alerts:
+        alert["_dt"] = parse_alert_date(alert.get("alertDate") or "") or epoch
+    alerts.sort(key=operator.itemgetter("_dt"))
     
     # Determine status string based on date_cursor
     processing_status = "MF_PROCESSING" if args.date_cursor is not None else "PROCESSING"
@@ -411,40 +462,109 @@ def main():
     write_status_file(processing_status, total_count=total_alerts, processed_count=0, board_id=device_id)
     logger.info(f"Status file updated: {processing_status} with {total_alerts} total alerts")
     
-    # Process each alert with progress bar
+    # Process alerts concurrently with progress bar (each alert is I/O bound:
+    # ffmpeg extraction, S3 uploads, API update)
     successful = 0
     failed = 0
-    processed_alerts = []
-    
-    with LoggingTqdm(total=len(alerts), desc="Processing alerts", unit="alert", 
+    # Positional result slots: each worker writes only its own index, so the
+    # list never grows under the lock and the final order stays sorted
+    processed_alerts = [None] * total_alerts
+    # Local clip/thumbnail paths per alert id; deletions are queued only once
+    # the bulk API update confirms the alert, so failures keep their files
+    # on disk for debugging (same as the per-alert update path)
+    deferred_cleanup = {}
+    counters_lock = threading.Lock()
+    max_workers = config.max_workers
+    # Persist progress on milestones only: every 10th completion or when 2s
+    # have passed, not per alert. Terminal states are always written below.
+    last_status_write = time.monotonic()
+
+    # Hoisted out of run_alert: the logging manager lookup (with its lock)
+    # happens once, not per alert; workers only wrap it in a thin adapter
+    raw_alert_logger = logging.getLogger(__name__)
+
+    def run_alert(alert):
+        alert_id = alert.get("id")
+        alert_logger = ContextualLoggerAdapter(
+            raw_alert_logger, {"correlation_id": correlation_id, "alert_id": alert_id}
+        )
+        with PerformanceLogger(alert_logger, f"process_alert_{alert_id}", alert_id=alert_id):
+            return process_alert(
+                alert, clip_extractor, s3_uploader, api_client,
+                max_retries=config.max_retries, retry_delay_seconds=config.retry_delay_seconds,
+                update_api=False, logger=alert_logger
+            )
+
+    logger.info(f"Processing {total_alerts} alert(s) with {max_workers} worker(s)")
+
+    with LoggingTqdm(total=len(alerts), desc="Processing alerts", unit="alert",
                      bar_format='{desc}: {percentage:3.0f}%|{bar}| {n_fmt}/{total_fmt} [{elapsed}<{remaining}, {rate_fmt}]',
                      resume_logger=resume_logger) as pbar:
-        for alert in alerts:
-            alert_id = alert.get("id")
-            alert_logger = get_logger(__name__, {"correlation_id": correlation_id, "alert_id": alert_id})
-            
-            pbar.set_description(f"Processing alert {alert_id}")
-            
-            with PerformanceLogger(alert_logger, f"process_alert_{alert_id}", alert_id=alert_id):
-                success, video_url, thumbnail_url = process_alert(
-                    alert, clip_extractor, s3_uploader, api_client,
-                    max_retries=config["max_retries"], retry_delay_seconds=config["retry_delay_seconds"]
-                )
-            
-            if success:
-                successful += 1
-                processed_alerts.append((alert, video_url, thumbnail_url))
-                pbar.set_postfix({"✓": successful, "✗": failed})
-            else:
-                failed += 1
-                pbar.set_postfix({"✓": successful, "✗": failed})
-                logger.error(f"Alert {alert_id} processing failed", extra={"alert_id": alert_id})
-            
-            # Update status file with successful count
-            write_status_file(processing_status, total_count=total_alerts, processed_count=successful, board_id=device_id)
-            
-            pbar.update(1)
-    
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {executor.submit(run_alert, alert): (idx, alert)
+                       for idx, alert in enumerate(alerts)}
+            for future in as_completed(futures):
+                idx, alert = futures[future]
+                alert_id = alert.get("id")
+                try:
+                    result = future.result()
+                except Exception as e:
+                    logger.error("Alert %s processing raised: %s", alert_id, e, extra={"alert_id": alert_id}, exc_info=True)
+                    result = AlertResult(False, None, None)
+
+                with counters_lock:
+                    if result.success:
+                        successful += 1
+                        processed_alerts[idx] = (alert, result.video_url, result.thumbnail_url)
+                        if result.local_files:
+                            deferred_cleanup[alert_id] = result.local_files
+                    else:
+                        failed += 1
+                        logger.error("Alert %s processing failed", alert_id, extra={"alert_id": alert_id})
+                    pbar.set_postfix({"✓": successful, "✗": failed})
+
+                    # Update status file with successful count (milestones only)
+                    done = successful + failed
+                    now = time.monotonic()
+                    if done == total_alerts or done % 10 == 0 or now - last_status_write >= 2.0:
+                        write_status_file(processing_status, total_count=total_alerts, processed_count=successful, board_id=device_id)
+                        last_status_write = now
+
+                    pbar.update(1)
+
+    # Drop the slots of failed alerts, preserving date order
+    processed_alerts = [entry for entry in processed_alerts if entry is not None]
+
+    # Workers deferred their API updates; push them all in one bulk request
+    # (with a per-alert fallback inside the client if the backend lacks the
+    # bulk route)
+    if processed_alerts:
+        updates = [
+            {"alert_id": alert.get("id"), "video_url": video_url, "thumbnail_url": thumbnail_url or ""}
+            for alert, video_url, thumbnail_url in processed_alerts
+        ]
+        with PerformanceLogger(logger, "update_secondary_videos_bulk", update_count=len(updates)):
+            updated_ids = set(api_client.update_secondary_videos_bulk(updates))
+
+        api_failures = [u["alert_id"] for u in updates if u["alert_id"] not in updated_ids]
+        if api_failures:
+            logger.error(f"API update failed for {len(api_failures)} alert(s)",
+                         extra={"alert_ids": api_failures})
+            successful -= len(api_failures)
+            failed += len(api_failures)
+            processed_alerts = [
+                entry for entry in processed_alerts if entry[0].get("id") in updated_ids
+            ]
+
+        # Now that the API state is known, delete local files only for
+        # confirmed alerts; failed ones keep theirs for debugging
+        for updated_id in updated_ids:
+            for local_path in deferred_cleanup.pop(updated_id, ()):
+                s3_uploader.queue_local_cleanup(local_path)
+        if deferred_cleanup:
+            logger.info("Keeping local files for %s alert(s) whose API update failed",
+                        len(deferred_cleanup))
+
     # Send batch email with all processed alerts if email sender is configured
     if email_sender and processed_alerts:
         with LoggingTqdm(desc="Sending email notification", total=1, 
@@ -453,6 +573,9 @@ def main():
                 email_sender.send_batch_alert_email(processed_alerts)
             pbar.update(1)
     
+    # Drain any local-file deletions still queued by the workers
+    s3_uploader.flush_cleanup()
+
     # Write FINISHED status
     write_status_file("FINISHED", total_count=total_alerts, processed_count=successful, board_id=device_id)
     logger.info(f"Status file updated: FINISHED with {total_alerts} total alerts, {successful} successfully processed")
@@ -1,22 +1,105 @@
 """
 Alert processing logic
 """
+import os
+import random
+import re
+import sys
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
-from typing import Dict, Optional, Tuple
+from functools import lru_cache
+from typing import Dict, NamedTuple, Optional, Tuple
 
 from src.core.clip_extractor import ClipExtractor
 from src.core.s3_uploader import S3Uploader
 from src.core.api_client import APIClient
 from src.utils.logger_config import get_logger, PerformanceLogger
 
+# Hoisted so the parse path below doesn't re-resolve the tz attribute per call
+_UTC = timezone.utc
 
-def process_alert(alert: Dict, clip_extractor: ClipExtractor, 
-                  s3_uploader: S3Uploader, api_client: APIClient, 
-                  max_retries: int = 3, retry_delay_seconds: int = 2) -> Tuple[bool, Optional[str], Optional[str]]:
+# datetime.fromisoformat accepts a trailing 'Z' natively on Python 3.11+, so
+# the per-call replace() allocation is only needed on older interpreters
+if sys.version_info >= (3, 11):
+    _parse_iso = datetime.fromisoformat
+else:
+    def _parse_iso(s: str) -> datetime:
+        return datetime.fromisoformat(s.replace('Z', '+00:00'))
+
+
+# Plain-UTC ISO shape whose timestamp can be sliced without building a datetime
+_ISO_UTC_RE = re.compile(r"\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}(?:\.\d+)?(?:Z|\+00:00)?$")
+
+
+def _fast_iso_timestamp(alert_date: str) -> Optional[str]:
+    """
+    Derive the S3 key timestamp by slicing an already-UTC ISO string
+
+    Returns None for any other shape (offset timezones, odd formats), in
+    which case the caller falls back to the full memoized parse.
+    """
+    if not alert_date or not _ISO_UTC_RE.match(alert_date):
+        return None
+    s = alert_date
+    return f"{s[0:4]}{s[5:7]}{s[8:10]}_{s[11:13]}{s[14:16]}{s[17:19]}"
+
+
+def sleep_backoff(attempt: int, base: float, cap: float = 60.0) -> None:
+    """
+    Sleep for an exponentially growing, jittered interval
+
+    Jitter (x0.5-1.5) keeps pooled workers that fail in lockstep (e.g. S3
+    throttling) from retrying in lockstep too.
+
+    Args:
+        attempt: Zero-based retry attempt number
+        base: Base delay in seconds
+        cap: Upper bound on the un-jittered delay in seconds
+    """
+    time.sleep(min(cap, base * (2 ** attempt)) * random.uniform(0.5, 1.5))
+
+
+class AlertResult(NamedTuple):
+    """Outcome of processing one alert"""
+    success: bool
+    video_url: Optional[str]
+    thumbnail_url: Optional[str]
+    # Local artifacts whose deletion was deferred (update_api=False): the
+    # caller queues them for cleanup once the alert's API update is confirmed
+    local_files: Tuple[str, ...] = ()
+
+
+@lru_cache(maxsize=2048)
+def parse_alert_date(alert_date: str) -> Optional[datetime]:
+    """
+    Parse an ISO alertDate string into an aware UTC datetime
+
+    Memoized on the raw string so the sort in main() and the S3 timestamp
+    generation in process_alert() only ever parse each alertDate once.
+
+    Args:
+        alert_date: Alert datetime in ISO format (e.g., 2025-12-10T12:34:56Z)
+
+    Returns:
+        Timezone-aware UTC datetime, or None if parsing fails
+    """
+    try:
+        dt = _parse_iso(alert_date)
+    except (ValueError, TypeError):
+        return None
+    if dt.tzinfo is None:
+        return dt.replace(tzinfo=_UTC)
+    return dt.astimezone(_UTC)
+
+
+def process_alert(alert: Dict, clip_extractor: ClipExtractor,
+                  s3_uploader: S3Uploader, api_client: APIClient,
+                  max_retries: int = 3, retry_delay_seconds: int = 2,
+                  update_api: bool = True, logger=None) -> AlertResult:
     """
     Process a single alert: extract clip, upload to S3, update API
-    
+
     Args:
         alert: Alert dictionary with alertDate and id
         clip_extractor: ClipExtractor instance
@@ -24,28 +107,35 @@ def process_alert(alert: Dict, clip_extractor: ClipExtractor,
         api_client: APIClient instance
         max_retries: Maximum number of retry attempts for network failures
         retry_delay_seconds: Initial delay between retries (doubles with each retry)
-        
+        update_api: If False, skip the per-alert API update; the caller is
+                    expected to batch updates via update_secondary_videos_bulk
+        logger: Optional contextual logger to reuse; one is built per alert
+                when not supplied
+
     Returns:
-        Tuple of (success: bool, video_url: Optional[str], thumbnail_url: Optional[str])
-        Returns (True, video_url, thumbnail_url) if successful, (False, None, None) if failed
+        AlertResult(success, video_url, thumbnail_url, local_files); success
+        is True with both URLs set on the happy path, False with None URLs on
+        failure. local_files is only populated when update_api is False and
+        lists the local artifacts to delete once the API update is confirmed.
     """
     alert_id = alert.get("id")
     alert_date = alert.get("alertDate")
     
-    # Get logger with alert context
-    logger = get_logger(__name__, {"alert_id": alert_id})
+    # Reuse the caller's contextual logger when provided instead of building
+    # a second adapter per alert
+    if logger is None:
+        logger = get_logger(__name__, {"alert_id": alert_id})
     
     if not alert_id or not alert_date:
-        logger.error(f"Alert missing required fields (id or alertDate): {alert}")
-        return False, None, None
+        logger.error("Alert missing required fields (id or alertDate): %s", alert)
+        return AlertResult(False, None, None)
     
-    logger.info(f"Processing alert with date {alert_date}", extra={"alert_date": alert_date})
+    logger.info("Processing alert with date %s", alert_date, extra={"alert_date": alert_date})
     
     # Extract clip with retry logic for network failures
     mp4_file = None
     thumbnail_file = None
-    retry_delay = retry_delay_seconds
-    
+
     for attempt in range(max_retries):
         with PerformanceLogger(logger, "extract_clip", attempt=attempt + 1):
             mp4_file, thumbnail_file = clip_extractor.extract_clip(alert_date)
@@ -55,60 +145,86 @@ def process_alert(alert: Dict, clip_extractor: ClipExtractor,
         
         if attempt < max_retries - 1:
             logger.warning(
-                f"Clip extraction failed, retrying in {retry_delay} seconds...",
+                "Clip extraction failed, retrying with backoff (attempt %s/%s)",
+                attempt + 1, max_retries,
                 extra={"attempt": attempt + 1, "max_retries": max_retries}
             )
-            time.sleep(retry_delay)
-            retry_delay *= 2  # Exponential backoff
+            sleep_backoff(attempt, retry_delay_seconds)
         else:
             logger.error(
-                f"Failed to extract clip after {max_retries} attempts",
+                "Failed to extract clip after %s attempts", max_retries,
                 extra={"max_retries": max_retries}
             )
-            return False, None, None
+            return AlertResult(False, None, None)
     
     if not mp4_file:
         logger.error("Failed to extract clip")
-        return False, None, None
+        return AlertResult(False, None, None)
     
-    # Generate timestamp for S3 key (from alert_date - must use alertDate, not current date)
-    try:
-        alert_time = datetime.fromisoformat(alert_date.replace('Z', '+00:00'))
-        if alert_time.tzinfo is None:
-            alert_time = alert_time.replace(tzinfo=timezone.utc)
-        else:
-            alert_time = alert_time.astimezone(timezone.utc)
+    # Generate timestamp for S3 key (from alert_date - must use alertDate, not
+    # current date). Plain-UTC strings are sliced directly; anything else goes
+    # through the full memoized parse.
+    timestamp = _fast_iso_timestamp(alert_date)
+    if timestamp is None:
+        alert_time = parse_alert_date(alert_date)
+        if alert_time is None:
+            logger.error("Failed to parse alert date", extra={"alert_date": alert_date})
+            logger.error("Cannot generate clip name without valid alertDate. Skipping this alert.")
+            return AlertResult(False, None, None)
         timestamp = alert_time.strftime('%Y%m%d_%H%M%S')
-        logger.debug(f"Generated timestamp from alertDate", extra={"timestamp": timestamp})
-    except Exception as e:
-        logger.error(f"Failed to parse alert date: {e}", extra={"alert_date": alert_date}, exc_info=True)
-        logger.error("Cannot generate clip name without valid alertDate. Skipping this alert.")
-        return False, None, None
-    
-    # Upload video to S3
-    with PerformanceLogger(logger, "upload_video_to_s3", timestamp=timestamp):
-        s3_url = s3_uploader.upload_file(mp4_file, timestamp)
+    logger.debug("Generated timestamp from alertDate", extra={"timestamp": timestamp})
     
+    # Degenerate thumbnails (failed ffmpeg runs can leave near-empty files)
+    # are not worth an S3 PUT
+    if thumbnail_file:
+        try:
+            if os.path.getsize(thumbnail_file) < 1024:
+                logger.info("Thumbnail is under 1 KB, skipping upload",
+                            extra={"thumbnail_file": thumbnail_file})
+                s3_uploader.queue_local_cleanup(thumbnail_file)
+                thumbnail_file = None
+        except OSError:
+            thumbnail_file = None
+
+    # Upload video and thumbnail to S3 concurrently (independent keys, so the
+    # thumbnail upload hides behind the larger video upload)
+    thumbnail_url = None
+    with PerformanceLogger(logger, "upload_to_s3", timestamp=timestamp):
+        with ThreadPoolExecutor(max_workers=2) as uploads:
+            video_future = uploads.submit(s3_uploader.upload_file, mp4_file, timestamp)
+            thumbnail_future = None
+            if thumbnail_file:
+                thumbnail_future = uploads.submit(s3_uploader.upload_thumbnail, thumbnail_file, timestamp)
+            s3_url = video_future.result()
+            if thumbnail_future:
+                thumbnail_url = thumbnail_future.result()
+
     if not s3_url:
         logger.error("Failed to upload clip to S3")
         # Clean up local files
-        s3_uploader.cleanup_local_file(mp4_file)
+        s3_uploader.queue_local_cleanup(mp4_file)
         if thumbnail_file:
-            s3_uploader.cleanup_local_file(thumbnail_file)
-        return False, None, None
-    
-    # Upload thumbnail to S3 if available
-    thumbnail_url = None
+            s3_uploader.queue_local_cleanup(thumbnail_file)
+        return AlertResult(False, None, None)
+
     if thumbnail_file:
-        with PerformanceLogger(logger, "upload_thumbnail_to_s3", timestamp=timestamp):
-            thumbnail_url = s3_uploader.upload_thumbnail(thumbnail_file, timestamp)
-        
         if thumbnail_url:
-            logger.info(f"Thumbnail uploaded", extra={"thumbnail_url": thumbnail_url})
+            logger.info("Thumbnail uploaded", extra={"thumbnail_url": thumbnail_url})
         else:
             logger.warning("Failed to upload thumbnail, continuing without thumbnail")
     
-    # Update API
+    # Update API (or defer to a caller-side bulk update)
+    if not update_api:
+        logger.info(
+            "Deferring API update for bulk submission",
+            extra={"video_url": s3_url, "thumbnail_url": thumbnail_url}
+        )
+        # Hand the local paths back instead of deleting now: if the bulk
+        # update later fails for this alert, the files stay on disk for
+        # debugging, same as the per-alert path below
+        local_files = (mp4_file, thumbnail_file) if thumbnail_file else (mp4_file,)
+        return AlertResult(True, s3_url, thumbnail_url, local_files)
+
     try:
         with PerformanceLogger(logger, "update_api_secondary_video"):
             api_client.update_secondary_video(alert_id, s3_url, thumbnail_url or "")
@@ -119,12 +235,12 @@ def process_alert(alert: Dict, clip_extractor: ClipExtractor,
         )
         
         # Clean up local files after successful upload and API update
-        s3_uploader.cleanup_local_file(mp4_file)
+        s3_uploader.queue_local_cleanup(mp4_file)
         if thumbnail_file:
-            s3_uploader.cleanup_local_file(thumbnail_file)
-        return True, s3_url, thumbnail_url
+            s3_uploader.queue_local_cleanup(thumbnail_file)
+        return AlertResult(True, s3_url, thumbnail_url)
     except Exception as e:
-        logger.error(f"Failed to update API: {e}", exc_info=True)
+        logger.error("Failed to update API: %s", e, exc_info=True)
         # Keep local file for debugging if API update fails
-        return False, None, None
+        return AlertResult(False, None, None)
 
@@ -2,13 +2,33 @@
 API Client for interacting with the alerts API
 Handles fetching alerts and updating alert secondary video URLs
 """
+import json
 import os
 import requests
 import logging
+from requests.adapters import HTTPAdapter
 from typing import List, Dict, Optional
 from datetime import datetime
+from src.utils.env_utils import env_str
 from src.utils.logger_config import get_logger, PerformanceLogger
 
+# orjson parses large alert payloads 2-3x faster than stdlib json; fall back
+# to the stdlib when it is not installed
+try:
+    import orjson
+
+    def _json_loads(data):
+        return orjson.loads(data)
+
+    def _json_dumps(obj):
+        return orjson.dumps(obj)
+except ImportError:
+    def _json_loads(data):
+        return json.loads(data)
+
+    def _json_dumps(obj):
+        return json.dumps(obj).encode("utf-8")
+
 
 class APIClient:
     """Client for interacting with the alerts API"""
@@ -35,17 +55,22 @@ class APIClient:
         self.secondary_video_endpoint = secondary_video_endpoint
         self.device_id = device_id
         
-        # Get API key from environment variable
-        api_key = os.environ.get("STOREYES_API_KEY")
-        if api_key:
-            api_key = api_key.strip()
-        self.api_key = api_key if api_key else None
+        # Get API key from environment variable (pre-stripped by env_str)
+        self.api_key = env_str("STOREYES_API_KEY") or None
         
         self.tasks_api_base_url = tasks_api_base_url.rstrip('/') if tasks_api_base_url else None
         self.tasks_endpoint = tasks_endpoint or "/api/tasks"
         self.task_status_endpoint = task_status_endpoint or "/api/status/{task_id}"
         self.store_code = store_code
         self.logger = get_logger(__name__)
+
+        # One pooled session for all API calls: connections stay warm across
+        # repeated get_alerts/update_secondary_video calls (and across worker
+        # threads), avoiding a TLS handshake per request
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=16, pool_maxsize=64)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
         
         # Log API key status
         if self.api_key:
@@ -83,9 +108,9 @@ class APIClient:
         try:
             with PerformanceLogger(self.logger, "get_global_settings"):
                 headers = self._get_headers()
-                response = requests.get(url, headers=headers, timeout=30)
+                response = self.session.get(url, headers=headers, timeout=30)
                 response.raise_for_status()
-                settings = response.json()
+                settings = _json_loads(response.content)
             
             self.logger.info("Successfully fetched global settings from API")
             return settings
@@ -117,9 +142,9 @@ class APIClient:
         try:
             with PerformanceLogger(self.logger, "get_alerts", date=date):
                 headers = self._get_headers()
-                response = requests.get(url, params=params, headers=headers, timeout=30)
+                response = self.session.get(url, params=params, headers=headers, timeout=30)
                 response.raise_for_status()
-                alerts = response.json()
+                alerts = _json_loads(response.content)
             
             self.logger.info(f"Retrieved alerts", extra={"alert_count": len(alerts)})
             return alerts
@@ -157,7 +182,7 @@ class APIClient:
         
         try:
             with PerformanceLogger(self.logger, "update_secondary_video", alert_id=alert_id):
-                response = requests.put(url, json=payload, headers=headers, timeout=30)
+                response = self.session.put(url, data=_json_dumps(payload), headers=headers, timeout=30)
                 response.raise_for_status()
             
             self.logger.info(f"Successfully updated alert", extra={"alert_id": alert_id})
@@ -171,35 +196,99 @@ class APIClient:
             self.logger.error(f"Failed to update alert: {e}", extra=error_extra, exc_info=True)
             raise
     
-    def get_tasks(self) -> Dict:
+    def update_secondary_videos_bulk(self, updates: List[Dict]) -> List:
         """
-        Fetch all tasks from the API
-        
+        Update secondary video/image URLs for several alerts in one request
+
+        Tries a single bulk PUT against the alerts endpoint; if the backend
+        does not expose a bulk route (404/405) or the bulk call fails, falls
+        back to one update_secondary_video call per alert over the pooled
+        session.
+
+        Args:
+            updates: List of dicts with alert_id, video_url and thumbnail_url keys
+
+        Returns:
+            List of alert IDs that were successfully updated
+        """
+        if not updates:
+            return []
+
+        url = f"{self.base_url}{self.alerts_endpoint}/secondary-videos"
+        payload = [
+            {
+                "alertId": u["alert_id"],
+                "secondaryVideoUrl": u["video_url"],
+                "imageUrl": u["thumbnail_url"]
+            }
+            for u in updates
+        ]
+        headers = self._get_headers()
+        headers["Content-Type"] = "application/json"
+
+        self.logger.info(f"Bulk updating secondary videos", extra={"update_count": len(updates)})
+
+        try:
+            with PerformanceLogger(self.logger, "update_secondary_videos_bulk", update_count=len(updates)):
+                response = self.session.put(url, data=_json_dumps(payload), headers=headers, timeout=60)
+                if response.status_code in (404, 405):
+                    self.logger.info("Bulk secondary-video endpoint unavailable, falling back to per-alert updates")
+                    raise requests.RequestException("bulk endpoint unavailable")
+                response.raise_for_status()
+
+            self.logger.info(f"Bulk update successful", extra={"update_count": len(updates)})
+            return [u["alert_id"] for u in updates]
+        except requests.RequestException as e:
+            self.logger.warning(f"Bulk secondary-video update failed, falling back to per-alert updates: {e}")
+
+        # Per-alert fallback: each failure is logged by update_secondary_video
+        updated = []
+        for u in updates:
+            try:
+                self.update_secondary_video(u["alert_id"], u["video_url"], u["thumbnail_url"])
+                updated.append(u["alert_id"])
+            except requests.RequestException:
+                continue
+        return updated
+
+    def get_tasks(self, type_: Optional[str] = "outcome-comparator",
+                  since: Optional[datetime] = None) -> Dict:
+        """
+        Fetch tasks from the API, filtered server-side where possible
+
+        Args:
+            type_: Task type to filter on (None fetches all types)
+            since: Only return tasks started after this time; servers that
+                   ignore the parameter simply return the full list
+
         Returns:
             Dictionary with "tasks" key containing list of task dictionaries
-            
+
         Raises:
             requests.RequestException: If the API request fails
         """
         if not self.tasks_api_base_url:
             raise ValueError("Tasks API base URL not configured")
-        
+
         url = f"{self.tasks_api_base_url}{self.tasks_endpoint}"
-        
+
         # Build query parameters
         params = {}
         if self.store_code:
             params["store_code"] = self.store_code
-        params["type"] = "outcome-comparator"
+        if type_:
+            params["type"] = type_
+        if since is not None:
+            params["since"] = since.isoformat()
         
         self.logger.info(f"Fetching tasks from {url}", extra={"params": params})
         
         try:
             with PerformanceLogger(self.logger, "get_tasks"):
                 headers = self._get_headers()
-                response = requests.get(url, params=params, headers=headers, timeout=30)
+                response = self.session.get(url, params=params, headers=headers, timeout=30)
                 response.raise_for_status()
-                tasks_data = response.json()
+                tasks_data = _json_loads(response.content)
             
             task_count = len(tasks_data.get("tasks", []))
             self.logger.debug(f"Retrieved tasks", extra={"task_count": task_count})
@@ -236,9 +325,9 @@ class APIClient:
         try:
             with PerformanceLogger(self.logger, "get_task_status", task_id=task_id):
                 headers = self._get_headers()
-                response = requests.get(url, params=params, headers=headers, timeout=30)
+                response = self.session.get(url, params=params, headers=headers, timeout=30)
                 response.raise_for_status()
-                status_data = response.json()
+                status_data = _json_loads(response.content)
             
             status = status_data.get("status", "unknown")
             self.logger.debug(f"Retrieved task status", extra={"task_id": task_id, "status": status})
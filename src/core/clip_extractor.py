@@ -8,12 +8,15 @@ import os
 import logging
 import re
 import math
-import shutil
+import threading
+import uuid
 from typing import Optional, List, Dict, Tuple
 from pathlib import Path
 from src.utils.video_utils import (
     ensure_browser_playable_mp4,
     ffmpeg_global_thread_args,
+    ffmpeg_path,
+    ffprobe_path,
     should_run_browser_reencode,
 )
 
@@ -52,7 +55,15 @@ class ClipExtractor:
         
         # Create output directory if it doesn't exist
         os.makedirs(self.output_dir, exist_ok=True)
-        
+
+        # Chunk-listing cache: the source directory is effectively static for
+        # the duration of a run, so listing + filename parsing is done once and
+        # shared across alerts (and worker threads). Invalidated by directory
+        # mtime so chunks written mid-run are still picked up.
+        self._chunks_cache: Optional[List[Dict]] = None
+        self._chunks_cache_mtime: Optional[float] = None
+        self._chunks_cache_lock = threading.Lock()
+
         logging.info(f"Using local source directory: {self.local_source_dir}")
     
     
@@ -85,18 +96,23 @@ class ClipExtractor:
     
     def _list_local_chunks(self) -> List[Dict]:
         """
-        List all video chunks from local directory
-        
+        List all video chunks from local directory (cached per directory mtime)
+
         Returns:
             List of chunk dictionaries with keys: path, name, S (start time), E (end time)
         """
         chunks = []
-        
+
         if not os.path.exists(self.local_source_dir):
             logging.error(f"Local source directory does not exist: {self.local_source_dir}")
             return []
-        
+
         try:
+            dir_mtime = os.stat(self.local_source_dir).st_mtime
+            with self._chunks_cache_lock:
+                if self._chunks_cache is not None and self._chunks_cache_mtime == dir_mtime:
+                    return self._chunks_cache
+
             for filename in os.listdir(self.local_source_dir):
                 if not filename.endswith('.mp4'):
                     continue
@@ -121,6 +137,9 @@ class ClipExtractor:
             # Sort chunks by start time
             chunks.sort(key=lambda x: x["S"])
             logging.debug(f"Found {len(chunks)} video chunks in local directory")
+            with self._chunks_cache_lock:
+                self._chunks_cache = chunks
+                self._chunks_cache_mtime = dir_mtime
             return chunks
             
         except Exception as e:
@@ -202,12 +221,16 @@ class ClipExtractor:
 
     def _ffprobe_duration_seconds(self, video_path: str) -> Optional[float]:
         """Actual container duration in seconds (may differ slightly from wall-clock segment sum)."""
-        if not shutil.which("ffprobe"):
+        ffprobe = ffprobe_path()
+        if not ffprobe:
             return None
         try:
+            # close_fds=False lets CPython use posix_spawn instead of
+            # fork+exec, avoiding a page-table copy of this process per
+            # launch; Python-created fds are CLOEXEC anyway (PEP 446)
             r = subprocess.run(
                 [
-                    "ffprobe",
+                    ffprobe,
                     "-v", "error",
                     "-show_entries", "format=duration",
                     "-of", "default=noprint_wrappers=1:nokey=1",
@@ -217,6 +240,7 @@ class ClipExtractor:
                 text=True,
                 timeout=45,
                 check=True,
+                close_fds=False,
             )
             d = float(r.stdout.strip())
             if d > 0 and not math.isnan(d):
@@ -230,6 +254,7 @@ class ClipExtractor:
         video_file: str,
         alert_time: datetime.datetime,
         seek_seconds: float,
+        job_id: str,
     ) -> Optional[str]:
         """
         Generate a thumbnail JPEG from one frame at seek_seconds (alert moment in the clip).
@@ -238,12 +263,13 @@ class ClipExtractor:
             video_file: Path to the video file
             alert_time: Alert datetime for output filename
             seek_seconds: Time offset in the clip (seconds) for the frame to capture
+            job_id: Unique extraction id so concurrent jobs don't share a path
 
         Returns:
             Path to the thumbnail image, or None if generation failed
         """
         timestamp = alert_time.strftime('%Y%m%d_%H%M%S')
-        thumbnail_file = os.path.join(self.output_dir, f"thumb_{timestamp}.jpg")
+        thumbnail_file = os.path.join(self.output_dir, f"thumb_{timestamp}_{job_id}.jpg")
 
         seek = max(0.0, float(seek_seconds))
         probed = self._ffprobe_duration_seconds(video_file)
@@ -261,7 +287,8 @@ class ClipExtractor:
             ss = f"{seek:.3f}"
             subprocess.run(
                 [
-                    "ffmpeg",
+                    ffmpeg_path() or "ffmpeg",
+                    "-hide_banner", "-loglevel", "error", "-nostats",
                     "-y",
                     *ffmpeg_global_thread_args(),
                     "-ss", ss,
@@ -279,6 +306,7 @@ class ClipExtractor:
                 capture_output=True,
                 text=True,
                 timeout=120,
+                close_fds=False,
             )
             
             if os.path.exists(thumbnail_file) and os.path.getsize(thumbnail_file) > 0:
@@ -351,12 +379,15 @@ class ClipExtractor:
         # Process each selected chunk
         part_files = []
         temp_files_to_cleanup = []
-        
+
+        # Unique prefix so concurrent extractions don't collide on temp files
+        job_id = uuid.uuid4().hex[:8]
+
         try:
             for idx, chunk in enumerate(selected_chunks):
                 logging.info(f"Processing chunk {idx + 1}/{len(selected_chunks)}: {chunk['name']}")
-                
-                part_mp4 = os.path.join(self.output_dir, f"part_{idx}.mp4")
+
+                part_mp4 = os.path.join(self.output_dir, f"part_{job_id}_{idx}.mp4")
                 temp_files_to_cleanup.append(part_mp4)
                 
                 # Use local file directly
@@ -376,14 +407,17 @@ class ClipExtractor:
                 # Extract the relevant segment from the chunk
                 try:
                     subprocess.run([
-                        "ffmpeg", "-y",
+                        ffmpeg_path() or "ffmpeg",
+                        "-hide_banner", "-loglevel", "error", "-nostats",
+                        "-y",
                         *ffmpeg_global_thread_args(),
                         "-ss", str(offset_seconds),
                         "-i", local_mp4,
                         "-t", str(duration_seconds),
                         "-c", "copy",
                         part_mp4
-                    ], check=True, capture_output=True, text=True, timeout=60)
+                    ], check=True, capture_output=True, text=True, timeout=60,
+                       close_fds=False)
                 except subprocess.CalledProcessError as e:
                     logging.error(f"FFmpeg segment extraction failed: {e.stderr}")
                     logging.error(f"FFmpeg stdout: {e.stdout}")
@@ -404,8 +438,8 @@ class ClipExtractor:
             
             # Create concat file for ffmpeg
             timestamp = alert_time.strftime('%Y%m%d_%H%M%S')
-            output_file = os.path.join(self.output_dir, f"alert_clip_{timestamp}.mp4")
-            concat_file = os.path.join(self.output_dir, f"concat_{timestamp}.txt")
+            output_file = os.path.join(self.output_dir, f"alert_clip_{timestamp}_{job_id}.mp4")
+            concat_file = os.path.join(self.output_dir, f"concat_{timestamp}_{job_id}.txt")
             temp_files_to_cleanup.append(concat_file)
             
             # Write concat file
@@ -423,14 +457,17 @@ class ClipExtractor:
             
             try:
                 subprocess.run([
-                    "ffmpeg", "-y",
+                    ffmpeg_path() or "ffmpeg",
+                    "-hide_banner", "-loglevel", "error", "-nostats",
+                    "-y",
                     *ffmpeg_global_thread_args(),
                     "-f", "concat",
                     "-safe", "0",
                     "-i", concat_file,
                     "-c", "copy",  # Copy streams without re-encoding for speed
                     temp_concat_file
-                ], check=True, capture_output=True, text=True, timeout=300)
+                ], check=True, capture_output=True, text=True, timeout=300,
+                   close_fds=False)
             except subprocess.CalledProcessError as e:
                 logging.error(f"FFmpeg concatenation failed: {e.stderr}")
                 logging.error(f"FFmpeg stdout: {e.stdout}")
@@ -479,7 +516,7 @@ class ClipExtractor:
             seek_thumb = self._thumbnail_seek_seconds_for_alert(
                 selected_chunks, window_start, window_end, alert_time
             )
-            thumbnail_file = self._generate_thumbnail(output_file, alert_time, seek_thumb)
+            thumbnail_file = self._generate_thumbnail(output_file, alert_time, seek_thumb, job_id)
             
             # Clean up temporary files (but keep the final output and thumbnail)
             if output_file in temp_files_to_cleanup:
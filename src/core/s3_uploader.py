@@ -4,35 +4,99 @@ S3 Uploader for uploading video clips to S3
 import boto3
 import os
 import logging
+import queue
+import threading
 from typing import Optional
+from boto3.s3.transfer import TransferConfig
 
 
 class S3Uploader:
     """Handles uploading files to S3"""
     
-    def __init__(self, region: str, bucket: str, prefix: str):
+    def __init__(self, region: str, bucket: str, prefix: str, boto_config=None,
+                 multipart_concurrency: int = 8):
         """
         Initialize S3 uploader
-        
+
         Args:
             region: AWS region
             bucket: S3 bucket name
             prefix: S3 key prefix (e.g., alerts/)
+            boto_config: Optional botocore.config.Config for the S3 client
+                         (connection pool size, retry mode, etc.)
+            multipart_concurrency: Number of parallel part uploads for files
+                                   above the multipart threshold
         """
         self.region = region
         self.bucket = bucket
         self.prefix = prefix.rstrip('/') + '/' if prefix else ''
-        
-        # Create boto3 S3 client (credentials from environment variables)
+
+        # URL prefixes are fixed per uploader; build them once instead of
+        # re-running the f-strings on every upload
+        self._s3_uri_prefix = f"s3://{self.bucket}/"
+        self._https_prefix = f"https://{self.bucket}.s3.{self.region}.amazonaws.com/"
+
+        # One Session serves both the credential probe and the client, so
+        # the credential chain is walked exactly once; the resulting client
+        # is shared by all worker threads (botocore clients are thread-safe)
+        session = boto3.session.Session()
         self.client_kwargs = {"region_name": self.region}
-        self.s3_client = boto3.client("s3", **self.client_kwargs)
-    
-    def _check_credentials(self):
-        """Check if AWS credentials are available"""
+        if boto_config is not None:
+            self.client_kwargs["config"] = boto_config
+        self.s3_client = session.client("s3", **self.client_kwargs)
+
+        # Validate credentials once here; rebuilding a boto3 Session per
+        # upload just to probe the credential chain is pure overhead
+        self._credentials_ok = self._check_credentials(session)
+
+        # Multipart transfer settings: clips can be tens of MB, so upload parts
+        # in parallel. Small files (thumbnails) fall below the threshold and
+        # bypass multipart automatically.
+        self.transfer_config = TransferConfig(
+            multipart_threshold=8 * 1024 * 1024,
+            multipart_chunksize=8 * 1024 * 1024,
+            max_concurrency=multipart_concurrency,
+            use_threads=True
+        )
+
+        # Thumbnails are small JPEGs well under the multipart threshold;
+        # skip the transfer thread pool startup for them entirely
+        self.thumbnail_transfer_config = TransferConfig(use_threads=False)
+
+        # Local-file deletions are queued and drained by one background
+        # thread so the unlink syscalls stay off the per-alert critical path
+        self._cleanup_queue = queue.Queue()
+        self._cleanup_thread = threading.Thread(
+            target=self._drain_cleanup_queue, name="s3-local-cleanup", daemon=True
+        )
+        self._cleanup_thread.start()
+
+    def _drain_cleanup_queue(self):
+        """Consume queued local-file paths and delete them"""
+        while True:
+            local_file_path = self._cleanup_queue.get()
+            try:
+                self.cleanup_local_file(local_file_path)
+            finally:
+                self._cleanup_queue.task_done()
+
+    def queue_local_cleanup(self, local_file_path: str):
+        """
+        Queue a local file for background deletion
+
+        Args:
+            local_file_path: Path to the local file to remove
+        """
+        self._cleanup_queue.put(local_file_path)
+
+    def flush_cleanup(self):
+        """Block until all queued local-file deletions have completed"""
+        self._cleanup_queue.join()
+
+
+    def _check_credentials(self, session):
+        """Check if AWS credentials are available on the shared session"""
         try:
-            # Try to create a session to validate credentials
-            import boto3
-            session = boto3.Session()
             credentials = session.get_credentials()
             if credentials is None:
                 logging.error("AWS credentials not found!")
@@ -54,41 +118,47 @@ class S3Uploader:
         Returns:
             S3 URL of the uploaded file, or None if upload failed
         """
-        # Check credentials before proceeding
-        if not self._check_credentials():
+        # Credentials were validated once at construction
+        if not self._credentials_ok:
             return None
-        
-        if not os.path.exists(local_file_path):
-            logging.error(f"File does not exist: {local_file_path}")
-            return None
-        
+
+        # No exists() pre-check: the open below fails with the same
+        # information and skips a stat(2) per upload
+
         # Generate S3 key
-        filename = os.path.basename(local_file_path)
         s3_key = f"{self.prefix}{alert_timestamp}.mp4"
-        
-        logging.info(f"Uploading {local_file_path} to s3://{self.bucket}/{s3_key}")
+
+        logging.info(f"Uploading {local_file_path} to {self._s3_uri_prefix}{s3_key}")
         
         try:
             # Upload with Content-Type header set to video/mp4 for browser compatibility
             # This is critical - browsers need this MIME type to play videos inline
-            self.s3_client.upload_file(
-                local_file_path, 
-                self.bucket, 
-                s3_key,
-                ExtraArgs={'ContentType': 'video/mp4'}
-            )
+            # Stream from a large-buffered file object so boto3 reads the clip in
+            # few syscalls. ffmpeg needs a seekable output to finalize the MP4
+            # (moov atom), so the clip must exist on disk before upload anyway.
+            with open(local_file_path, 'rb', buffering=8 * 1024 * 1024) as file_obj:
+                self.s3_client.upload_fileobj(
+                    file_obj,
+                    self.bucket,
+                    s3_key,
+                    ExtraArgs={'ContentType': 'video/mp4'},
+                    Config=self.transfer_config
+                )
             
             # Generate S3 URL
-            s3_url = f"s3://{self.bucket}/{s3_key}"
-            
+            s3_url = self._s3_uri_prefix + s3_key
+
             # Also generate HTTPS URL
-            s3_https_url = f"https://{self.bucket}.s3.{self.region}.amazonaws.com/{s3_key}"
+            s3_https_url = self._https_prefix + s3_key
             
             logging.info(f"Successfully uploaded to {s3_url} with Content-Type: video/mp4")
             logging.debug(f"S3 HTTPS URL: {s3_https_url}")
             
             # Return HTTPS URL for API usage
             return s3_https_url
+        except OSError as e:
+            logging.error(f"Cannot read file for upload {local_file_path}: {e}")
+            return None
         except Exception as e:
             logging.error(f"Failed to upload file to S3: {e}")
             logging.exception("Full traceback:")
@@ -105,33 +175,36 @@ class S3Uploader:
         Returns:
             HTTPS URL of the uploaded thumbnail, or None if upload failed
         """
-        # Check credentials before proceeding
-        if not self._check_credentials():
+        # Credentials were validated once at construction
+        if not self._credentials_ok:
             return None
-        
-        if not os.path.exists(local_file_path):
-            logging.error(f"Thumbnail file does not exist: {local_file_path}")
-            return None
-        
+
+        # No exists() pre-check: boto3 opens the file itself and a missing
+        # path surfaces as an OSError below
+
         # Generate S3 key for thumbnail (use alerts/thumbs/ prefix)
         s3_key = f"alerts/thumbs/{alert_timestamp}.jpg"
-        
-        logging.info(f"Uploading thumbnail {local_file_path} to s3://{self.bucket}/{s3_key}")
+
+        logging.info(f"Uploading thumbnail {local_file_path} to {self._s3_uri_prefix}{s3_key}")
         
         try:
             # Upload thumbnail with correct Content-Type for images
             self.s3_client.upload_file(
-                local_file_path, 
-                self.bucket, 
+                local_file_path,
+                self.bucket,
                 s3_key,
-                ExtraArgs={'ContentType': 'image/jpeg'}
+                ExtraArgs={'ContentType': 'image/jpeg'},
+                Config=self.thumbnail_transfer_config
             )
             
             # Generate HTTPS URL
-            s3_https_url = f"https://{self.bucket}.s3.{self.region}.amazonaws.com/{s3_key}"
+            s3_https_url = self._https_prefix + s3_key
             
             logging.info(f"Successfully uploaded thumbnail to {s3_https_url} with Content-Type: image/jpeg")
             return s3_https_url
+        except OSError as e:
+            logging.error(f"Cannot read thumbnail for upload {local_file_path}: {e}")
+            return None
         except Exception as e:
             logging.error(f"Failed to upload thumbnail to S3: {e}")
             logging.exception("Full traceback:")
@@ -3,6 +3,7 @@ Connectivity testing utilities for API and S3
 """
 import os
 import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from typing import Tuple, Optional
 from src.utils.logger_config import get_logger, PerformanceLogger
@@ -145,27 +146,29 @@ def run_connectivity_tests(api_client: APIClient, s3_uploader: S3Uploader, test_
     logger.info("=" * 60)
     
     all_passed = True
-    
-    # Test API connectivity (global settings)
-    api_success, api_message = test_api_connectivity(api_client)
-    if not api_success:
-        all_passed = False
-    
-    print(f"\nAPI Test (Global Settings): {api_message}")
-    
-    # Test alerts API if date is provided
-    if test_date:
-        alerts_success, alerts_message = test_alerts_api(api_client, test_date)
-        if not alerts_success:
+
+    # Each test is dominated by network RTT, so run them concurrently and
+    # report in a fixed order once all have finished
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        api_future = executor.submit(test_api_connectivity, api_client)
+        alerts_future = executor.submit(test_alerts_api, api_client, test_date) if test_date else None
+        s3_future = executor.submit(test_s3_connectivity, s3_uploader)
+
+        api_success, api_message = api_future.result()
+        if not api_success:
             all_passed = False
-        print(f"API Test (Alerts for {test_date}): {alerts_message}")
-    
-    # Test S3 connectivity
-    s3_success, s3_message = test_s3_connectivity(s3_uploader)
-    if not s3_success:
-        all_passed = False
-    
-    print(f"S3 Test: {s3_message}")
+        print(f"\nAPI Test (Global Settings): {api_message}")
+
+        if alerts_future is not None:
+            alerts_success, alerts_message = alerts_future.result()
+            if not alerts_success:
+                all_passed = False
+            print(f"API Test (Alerts for {test_date}): {alerts_message}")
+
+        s3_success, s3_message = s3_future.result()
+        if not s3_success:
+            all_passed = False
+        print(f"S3 Test: {s3_message}")
     
     logger.info("=" * 60)
     if all_passed:
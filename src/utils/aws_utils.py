@@ -2,25 +2,37 @@
 AWS utilities for credential management
 """
 import os
-from src.utils.logger_config import get_logger
+from functools import lru_cache
+import boto3
+from src.utils.env_utils import env_str
+from src.utils.logger_config import get_logger, PerformanceLogger
+
+
+@lru_cache(maxsize=1)
+def resolve_aws_region():
+    """
+    Resolve the AWS region from the environment, once
+
+    Memoized so every consumer sees the same value even if the environment
+    changes mid-run.
+
+    Returns:
+        Stripped region string, or None if neither AWS_DEFAULT_REGION nor
+        AWS_REGION is set
+    """
+    region = os.environ.get("AWS_DEFAULT_REGION") or os.environ.get("AWS_REGION")
+    return region.strip() if region else None
 
 
 def setup_aws_credentials(config):
     """Set up AWS credentials from environment variables"""
     logger = get_logger(__name__)
-    
-    # Read credentials from environment variables
-    access_key = os.environ.get("AWS_ACCESS_KEY_ID")
-    secret_key = os.environ.get("AWS_SECRET_ACCESS_KEY")
-    region = os.environ.get("AWS_DEFAULT_REGION")
-    
-    if access_key:
-        access_key = access_key.strip()
-    if secret_key:
-        secret_key = secret_key.strip()
-    if region:
-        region = region.strip()
-    
+
+    # Read credentials from environment variables (pre-stripped by env_str)
+    access_key = env_str("AWS_ACCESS_KEY_ID")
+    secret_key = env_str("AWS_SECRET_ACCESS_KEY")
+    region = env_str("AWS_DEFAULT_REGION")
+
     # Set environment variables if credentials are from env
     if access_key and secret_key:
         os.environ["AWS_ACCESS_KEY_ID"] = access_key
@@ -32,20 +44,32 @@ def setup_aws_credentials(config):
 
 
 def check_aws_credentials():
-    """Check if AWS credentials are available"""
+    """
+    Validate AWS credentials with one STS call
+
+    Resolving the credential chain and calling sts:GetCallerIdentity at
+    startup fails fast on bad credentials instead of surfacing the error on
+    the first S3 upload mid-run.
+    """
     logger = get_logger(__name__)
-    
-    access_key = os.environ.get("AWS_ACCESS_KEY_ID")
-    secret_key = os.environ.get("AWS_SECRET_ACCESS_KEY")
-    
-    if not access_key or not secret_key:
-        logger.error("AWS credentials not found!")
-        logger.error("Please add credentials to config.conf:")
-        logger.error("  [AWS]")
-        logger.error("  ACCESS_KEY_ID = your-access-key-id")
-        logger.error("  SECRET_ACCESS_KEY = your-secret-access-key")
+
+    try:
+        session = boto3.session.Session()
+        if session.get_credentials() is None:
+            logger.error("AWS credentials not found!")
+            logger.error("Please add credentials to config.conf:")
+            logger.error("  [AWS]")
+            logger.error("  ACCESS_KEY_ID = your-access-key-id")
+            logger.error("  SECRET_ACCESS_KEY = your-secret-access-key")
+            return False
+
+        with PerformanceLogger(logger, "sts_validate"):
+            sts = session.client("sts")
+            identity = sts.get_caller_identity()
+
+        logger.debug("AWS credentials validated", extra={"aws_account": identity.get("Account")})
+        return True
+    except Exception as e:
+        logger.error(f"AWS credential validation failed: {e}")
         return False
-    
-    logger.debug("AWS credentials configured")
-    return True
 
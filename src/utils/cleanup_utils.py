@@ -1,70 +1,70 @@
 """
 Cleanup utilities for removing temporary files
 """
+import logging
 import os
-from datetime import datetime
 from pathlib import Path
 from src.utils.logger_config import get_logger
 
 
 def cleanup_recordings(fetch_date):
     """Delete recordings matching pattern DDMMYYYY_*.mp4 (e.g., 08022026_221814.mp4)"""
+    # One logger for the whole pass; re-resolving it per branch was wasted work
+    logger = get_logger(__name__)
     try:
         # Extract date from fetch_date (format: 2026-02-08 or 2026-02-08T00:00:00Z)
         date_part = fetch_date.split('T')[0] if 'T' in fetch_date else fetch_date  # Get YYYY-MM-DD part
-        
-        # Parse date and convert to DDMMYYYY format
+
+        # Convert YYYY-MM-DD to DDMMYYYY (e.g., 08022026) by splitting; the
+        # input shape is fixed, so strptime's locale machinery is overkill
         try:
-            date_obj = datetime.strptime(date_part, '%Y-%m-%d')
-            date_pattern = date_obj.strftime('%d%m%Y')  # Convert to DDMMYYYY (e.g., 08022026)
-        except Exception as e:
-            try:
-                logger = get_logger(__name__)
-                logger.error(f"Failed to parse date {date_part}: {e}", exc_info=True)
-            except:
-                pass
+            y, m, d = date_part.split('-', 2)
+            if len(y) != 4 or len(m) != 2 or len(d) != 2 or not (y + m + d).isdigit():
+                raise ValueError(f"not a YYYY-MM-DD date: {date_part!r}")
+            date_pattern = f"{d}{m}{y}"
+        except ValueError as e:
+            logger.error(f"Failed to parse date {date_part}: {e}", exc_info=True)
             return
-        
+
         # Get recordings directory path
         recordings_dir = Path(os.path.expanduser("~")) / "recordings"
-        
+
         if not recordings_dir.exists():
-            try:
-                logger = get_logger(__name__)
-                logger.debug(f"Recordings directory does not exist: {recordings_dir}")
-            except:
-                pass
+            logger.debug("Recordings directory does not exist: %s", recordings_dir)
             return
-        
-        # Find all files matching pattern DDMMYYYY_*.mp4
+
+        # Find all files matching pattern DDMMYYYY_*.mp4 with one readdir
+        # pass and cheap string tests; glob would allocate a Path and run
+        # fnmatch per entry
         pattern = f"{date_pattern}_*.mp4"
-        matching_files = list(recordings_dir.glob(pattern))
-        
+        prefix = f"{date_pattern}_"
+        with os.scandir(recordings_dir) as it:
+            matching_files = [
+                entry.path for entry in it
+                if entry.name.startswith(prefix) and entry.name.endswith(".mp4")
+                and entry.is_file(follow_symlinks=False)
+            ]
+
         if not matching_files:
-            try:
-                logger = get_logger(__name__)
-                logger.debug(f"No recordings found matching pattern: {pattern}")
-            except:
-                pass
+            logger.debug("No recordings found matching pattern: %s", pattern)
             return
-        
-        # Delete matching files
+
+        # Delete matching files; skip the per-file debug formatting entirely
+        # when DEBUG is filtered out
         deleted_count = 0
-        logger = get_logger(__name__)
+        debug_enabled = logger.isEnabledFor(logging.DEBUG)
         for file_path in matching_files:
             try:
-                file_path.unlink()
+                os.unlink(file_path)
                 deleted_count += 1
-                logger.debug(f"Deleted recording file: {file_path}")
+                if debug_enabled:
+                    logger.debug("Deleted recording file: %s", file_path)
             except Exception as e:
-                logger.warning(f"Failed to delete recording file {file_path}: {e}", exc_info=True)
-        
+                # No traceback here: this fires per file and the exception
+                # message already carries the errno
+                logger.warning("Failed to delete recording file %s: %s", file_path, e)
+
         if deleted_count > 0:
-            logger.info(f"Cleaned up {deleted_count} recording file(s) matching pattern: {pattern}")
+            logger.info("Cleaned up %s recording file(s) matching pattern: %s", deleted_count, pattern)
     except Exception as e:
-        try:
-            logger = get_logger(__name__)
-            logger.error(f"Failed to cleanup recordings: {e}", exc_info=True)
-        except:
-            print(f"Error: Failed to cleanup recordings: {e}")
-
+        logger.error(f"Failed to cleanup recordings: {e}", exc_info=True)
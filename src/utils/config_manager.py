@@ -3,28 +3,73 @@ Configuration management for loading and parsing config files
 """
 import configparser
 import os
-from typing import Dict, Any, Optional
+from dataclasses import dataclass
+from typing import Optional, Tuple
+from src.utils.aws_utils import resolve_aws_region
 from src.utils.logger_config import get_logger
 
 
+@dataclass(frozen=True, slots=True)
+class AppConfig:
+    """Typed application configuration, parsed once at startup"""
+    aws_region: str
+    s3_bucket: str
+    s3_upload_prefix_template: str
+    multipart_concurrency: int
+    before_minutes: int
+    after_minutes: int
+    output_dir: str
+    chunk_duration_seconds: int
+    chunk_filename_pattern: Optional[str]
+    local_source_dir: str
+    max_retries: int
+    retry_delay_seconds: int
+    max_workers: int
+    api_base_url: str
+    alerts_endpoint: str
+    secondary_video_endpoint: str
+    email_enabled: bool
+    from_email: str = ""
+    to_emails: Tuple[str, ...] = ()
+    use_tls: bool = True
+
+
+# Parsed-config cache keyed by (path, mtime_ns, size): repeat loads of an
+# unchanged file are free, while an edited file invalidates naturally
+_config_cache = {}
+
+
 def load_config(config_file="config/config.conf") -> configparser.ConfigParser:
-    """Load configuration from config file"""
+    """Load configuration from config file, cached until the file changes"""
+    try:
+        st = os.stat(config_file)
+        key = (config_file, st.st_mtime_ns, st.st_size)
+    except OSError:
+        key = None
+    if key is not None and key in _config_cache:
+        return _config_cache[key]
     config = configparser.ConfigParser()
     config.read(config_file)
+    if key is not None:
+        _config_cache.clear()
+        _config_cache[key] = config
     return config
 
 
-def parse_config(config: configparser.ConfigParser, api_client) -> Dict[str, Any]:
+def parse_config(config: configparser.ConfigParser, api_client) -> AppConfig:
     """
-    Parse configuration and return structured dictionary
-    
+    Parse configuration into a frozen AppConfig
+
+    Every configparser lookup (with its .strip()/int() coercion) happens once
+    here; consumers get cheap attribute access on an immutable object.
+
     Args:
         config: ConfigParser object with config file contents
         api_client: APIClient instance for fetching global settings
-        
+
     Returns:
-        Dictionary with parsed configuration values
-        
+        AppConfig with parsed configuration values
+
     Raises:
         ValueError: If required configuration is missing
     """
@@ -50,13 +95,14 @@ def parse_config(config: configparser.ConfigParser, api_client) -> Dict[str, Any
         
         # Fallback to environment variable if not from API
         if not parsed.get("aws_region"):
-            aws_region = os.environ.get("AWS_DEFAULT_REGION") or os.environ.get("AWS_REGION")
+            aws_region = resolve_aws_region()
             if not aws_region:
                 raise ValueError("AWS region not found! Please set AWS_DEFAULT_REGION or AWS_REGION")
-            parsed["aws_region"] = aws_region.strip()
+            parsed["aws_region"] = aws_region
         
         parsed["s3_bucket"] = config.get("AWS", "S3_BUCKET").strip()
         parsed["s3_upload_prefix_template"] = config.get("AWS", "S3_UPLOAD_PREFIX", fallback="alerts/").strip()
+        parsed["multipart_concurrency"] = int(config.get("AWS", "MULTIPART_CONCURRENCY", fallback="8").strip())
         
         # Clip Configuration
         parsed["before_minutes"] = int(config.get("CLIP", "BEFORE_MINUTES").strip())
@@ -84,6 +130,7 @@ def parse_config(config: configparser.ConfigParser, api_client) -> Dict[str, Any
         # Processing Configuration
         parsed["max_retries"] = int(config.get("PROCESSING", "MAX_RETRIES", fallback="3").strip())
         parsed["retry_delay_seconds"] = int(config.get("PROCESSING", "RETRY_DELAY_SECONDS", fallback="2").strip())
+        parsed["max_workers"] = int(config.get("PROCESSING", "MAX_WORKERS", fallback="8").strip())
         
         # API Configuration
         api_base_url = config.get("API", "BASE_URL", fallback=None)
@@ -99,7 +146,7 @@ def parse_config(config: configparser.ConfigParser, api_client) -> Dict[str, Any
             parsed["email_enabled"] = True
             parsed["from_email"] = mail_settings.get("username", "").strip()
             recipients_str = mail_settings.get("receipients", "").strip()
-            parsed["to_emails"] = [email.strip() for email in recipients_str.split(',') if email.strip()]
+            parsed["to_emails"] = tuple(email.strip() for email in recipients_str.split(',') if email.strip())
             parsed["use_tls"] = True  # Default to True
             # Set SMTP settings in environment for EmailSender
             if mail_settings.get("server"):
@@ -117,7 +164,7 @@ def parse_config(config: configparser.ConfigParser, api_client) -> Dict[str, Any
             if parsed["email_enabled"]:
                 parsed["from_email"] = config.get("EMAIL", "FROM_EMAIL").strip()
                 to_emails_str = config.get("EMAIL", "TO_EMAILS").strip()
-                parsed["to_emails"] = [email.strip() for email in to_emails_str.split(',')]
+                parsed["to_emails"] = tuple(email.strip() for email in to_emails_str.split(','))
                 parsed["use_tls"] = config.getboolean("EMAIL", "USE_TLS", fallback=True)
         
         # MQTT Broker Configuration - prefer API settings, fallback to environment variables
@@ -139,8 +186,8 @@ def parse_config(config: configparser.ConfigParser, api_client) -> Dict[str, Any
             "aws_region": parsed["aws_region"],
             "email_enabled": parsed["email_enabled"]
         })
-        
-        return parsed
+
+        return AppConfig(**parsed)
         
     except Exception as e:
         logger.error(f"Failed to parse configuration: {e}", exc_info=True)
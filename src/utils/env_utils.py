@@ -0,0 +1,27 @@
+"""
+Environment variable helpers
+"""
+import os
+from functools import lru_cache
+
+
+@lru_cache(maxsize=None)
+def env_str(name: str, default: str = "") -> str:
+    """
+    Read and strip an environment variable, memoized per name
+
+    Centralizes the os.environ.get(...) + strip() pattern so every caller
+    gets uniform empty-string handling and repeat lookups are free. Call
+    env_str.cache_clear() if the environment is mutated after first read.
+
+    Args:
+        name: Environment variable name
+        default: Value returned when the variable is unset or blank
+
+    Returns:
+        Stripped value, or the default
+    """
+    value = os.environ.get(name)
+    if value:
+        value = value.strip()
+    return value if value else default
@@ -2,6 +2,7 @@
 Enterprise-grade logging configuration
 Provides structured logging with rotation, multiple handlers, and contextual information
 """
+import atexit
 import logging
 import logging.handlers
 import json
@@ -11,6 +12,17 @@ from datetime import datetime
 from typing import Optional, Dict, Any
 from pathlib import Path
 
+# orjson serializes log records several times faster than stdlib json; keep it
+# optional since deployed devices may not have it installed
+try:
+    import orjson
+
+    def _json_dumps(obj) -> str:
+        return orjson.dumps(obj, default=str).decode("utf-8")
+except ImportError:
+    def _json_dumps(obj) -> str:
+        return json.dumps(obj, ensure_ascii=False, default=str)
+
 
 class JSONFormatter(logging.Formatter):
     """Custom JSON formatter for structured logging"""
@@ -53,7 +65,7 @@ class JSONFormatter(logging.Formatter):
         if hasattr(record, "duration_ms"):
             log_data["duration_ms"] = record.duration_ms
         
-        return json.dumps(log_data, ensure_ascii=False)
+        return _json_dumps(log_data)
 
 
 class ContextualFormatter(logging.Formatter):
@@ -192,8 +204,18 @@ def setup_logging(
         )
     
     file_handler.setFormatter(file_formatter)
-    root_logger.addHandler(file_handler)
-    
+    # Coalesce bursts of per-alert records into fewer write() syscalls;
+    # errors flush through immediately and shutdown flushes the remainder
+    buffered_file_handler = logging.handlers.MemoryHandler(
+        capacity=512,
+        flushLevel=logging.ERROR,
+        target=file_handler,
+        flushOnClose=True
+    )
+    buffered_file_handler.setLevel(level)
+    atexit.register(buffered_file_handler.flush)
+    root_logger.addHandler(buffered_file_handler)
+
     # Error file handler (separate file for errors)
     error_log_file = log_path / f"error_{log_file}"
     error_handler = logging.handlers.RotatingFileHandler(
@@ -238,19 +260,34 @@ def get_logger(name: str, context: Optional[Dict[str, Any]] = None) -> Contextua
 
 class PerformanceLogger:
     """Context manager for performance logging"""
-    
+
+    __slots__ = ("logger", "operation", "context", "start_time", "_enabled")
+
     def __init__(self, logger: logging.Logger, operation: str, **context):
         self.logger = logger
         self.operation = operation
         self.context = context
         self.start_time = None
-    
+        # When INFO is filtered out, skip the timing and both log emits
+        # entirely; exceptions are still reported in __exit__
+        self._enabled = logger.isEnabledFor(logging.INFO)
+
     def __enter__(self):
+        if not self._enabled:
+            return self
         self.start_time = datetime.utcnow()
         self.logger.debug(f"Starting {self.operation}", extra=self.context)
         return self
-    
+
     def __exit__(self, exc_type, exc_val, exc_tb):
+        if not self._enabled:
+            if exc_type is not None:
+                self.logger.error(
+                    f"Failed {self.operation}",
+                    extra=self.context,
+                    exc_info=(exc_type, exc_val, exc_tb)
+                )
+            return
         if self.start_time:
             duration = (datetime.utcnow() - self.start_time).total_seconds() * 1000
             duration_ms = int(duration)
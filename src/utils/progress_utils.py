@@ -6,34 +6,34 @@ from tqdm import tqdm
 
 class LoggingTqdm(tqdm):
     """Custom tqdm that logs progress updates to resume log file"""
-    
-    def __init__(self, *args, resume_logger=None, **kwargs):
+
+    # Slot the attributes this subclass adds so the per-update fast path
+    # reads them from C-level slots instead of the instance __dict__
+    # (tqdm's own attributes still live in the dict it provides)
+    __slots__ = ("resume_logger", "_last_log", "_log_interval")
+
+    def __init__(self, *args, resume_logger=None, log_interval=1.0, **kwargs):
         self.resume_logger = resume_logger
+        # Rate limit for resume-log lines; completion always logs
+        self._log_interval = log_interval
+        self._last_log = 0.0
         super().__init__(*args, **kwargs)
         if self.resume_logger:
             self.resume_logger.info(f"Started: {self.desc}")
-    
+
     def update(self, n=1):
         result = super().update(n)
         if self.resume_logger and self.n > 0:
-            # Log progress update - use str() representation which tqdm provides safely
-            try:
-                # Use tqdm's string representation which handles all attributes safely
-                progress_str = str(self)
-                if progress_str:
-                    self.resume_logger.info(progress_str.strip())
-            except Exception:
-                # Fallback to simple logging if formatting fails
-                try:
-                    elapsed = getattr(self, 'elapsed', 0)
-                    if elapsed == 0 and hasattr(self, 'start_t') and hasattr(self, '_time'):
-                        elapsed = self._time() - self.start_t
-                    elapsed_str = f"{int(elapsed//60):02d}:{int(elapsed%60):02d}" if elapsed > 0 else "00:00"
-                    total_str = f"/{self.total}" if self.total else ""
-                    self.resume_logger.info(f"{self.desc}: {self.n}{total_str} {self.unit} [{elapsed_str}]")
-                except Exception:
-                    # Ultimate fallback
-                    self.resume_logger.info(f"{self.desc}: {self.n} {self.unit}")
+            # Rendering str(self) per tick is expensive; only log when the
+            # interval has elapsed or the bar just completed
+            now = self._time()
+            if now - self._last_log < self._log_interval and self.n != self.total:
+                return result
+            self._last_log = now
+            # A plain counter line is all the resume log needs; tqdm's
+            # str(self) formats the bar, rate and ETA for nothing here
+            total_str = f"/{self.total}" if self.total else ""
+            self.resume_logger.info(f"{self.desc}: {self.n}{total_str} {self.unit}")
         return result
     
     def set_description(self, desc=None, refresh=True):
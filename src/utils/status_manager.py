@@ -1,40 +1,70 @@
 """
 Status file management for tracking processing state and MQTT publishing
 """
+import atexit
+import logging
 import os
 import json
+import queue
+import random
+import threading
 import time
-from datetime import datetime, timezone
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional
+from typing import NamedTuple, Optional
 import paho.mqtt.client as mqtt
+from src.utils.env_utils import env_str
 from src.utils.logger_config import get_logger
 
+# orjson serializes several times faster than stdlib json and returns the
+# compact bytes paho wants directly; fall back to stdlib when unavailable
+try:
+    import orjson
+
+    def _json_dumps(obj) -> bytes:
+        return orjson.dumps(obj)
+except ImportError:
+    def _json_dumps(obj) -> bytes:
+        return json.dumps(obj, separators=(',', ':')).encode('utf-8')
+
+# Resolved once; the project root cannot change while the process runs.
+# status_manager lives in src/utils, so the root is two levels up.
+_STATUS_FILE = Path(__file__).resolve().parent.parent.parent / "alert-processor-status.txt"
+
+# Serializes concurrent writers (worker threads all report progress)
+_status_write_lock = threading.Lock()
+
 
 def get_status_file_path():
     """Get the path to the status file beside main.py"""
-    # Get the directory where main.py is located (project root)
-    # This assumes status_manager is in src/utils, so we go up 2 levels
-    current_file = Path(__file__).resolve()
-    project_root = current_file.parent.parent.parent
-    return project_root / "alert-processor-status.txt"
+    return _STATUS_FILE
+
+
+def _opt_int(value: str) -> Optional[int]:
+    """Parse an int, returning None for blank/garbage (int handles signs,
+    which the old isdigit check silently rejected)"""
+    try:
+        return int(value)
+    except ValueError:
+        return None
 
 
 def read_status_file():
     """Read status file and return status, total_count, processed_count"""
     status_file = get_status_file_path()
-    if not status_file.exists():
-        return None, None, None
-    
     try:
-        with open(status_file, 'r', encoding='utf-8') as f:
-            lines = [line.strip() for line in f.readlines()]
-        
-        status = lines[0] if len(lines) > 0 else None
-        total_count = int(lines[1]) if len(lines) > 1 and lines[1].isdigit() else None
-        processed_count = int(lines[2]) if len(lines) > 2 and lines[2].isdigit() else None
-        
+        # One read + split; only the first three lines are meaningful.
+        # A missing file is the normal first-run case, not an error.
+        data = status_file.read_text(encoding='utf-8')
+
+        parts = data.split('\n', 3)
+        status = parts[0].strip() or None
+        total_count = _opt_int(parts[1].strip()) if len(parts) > 1 else None
+        processed_count = _opt_int(parts[2].strip()) if len(parts) > 2 else None
+
         return status, total_count, processed_count
+    except FileNotFoundError:
+        return None, None, None
     except Exception as e:
         # Use basic logging if logger not yet initialized
         try:
@@ -45,7 +75,134 @@ def read_status_file():
         return None, None, None
 
 
-def _publish_mqtt_status(board_id: str, status: str, total_count: Optional[int] = None, 
+# States whose publish must survive broker hiccups (QoS >= 1 + ack wait)
+_TERMINAL_STATUSES = frozenset({"FINISHED", "EMPTY"})
+
+# Payload timestamp cache at one-second granularity; strftime routes through
+# libc locale handling, which is wasted work when the second hasn't changed.
+# Only the single writer thread touches these, so no lock is needed.
+_last_ts_int = -1
+_last_ts = ""
+
+
+def _utc_iso_now() -> str:
+    """UTC timestamp like 2026-08-28T12:34:56Z, cached within each second"""
+    global _last_ts_int, _last_ts
+    ts_int = int(time.time())
+    if ts_int != _last_ts_int:
+        tm = time.gmtime(ts_int)
+        _last_ts = (
+            f"{tm.tm_year:04d}-{tm.tm_mon:02d}-{tm.tm_mday:02d}"
+            f"T{tm.tm_hour:02d}:{tm.tm_min:02d}:{tm.tm_sec:02d}Z"
+        )
+        _last_ts_int = ts_int
+    return _last_ts
+
+
+class _MqttConfig(NamedTuple):
+    """MQTT connection settings, read from the environment once"""
+    host: str
+    port: int
+    user: str
+    password: str
+    topic_override: str
+    qos: int
+    retain: bool
+    timeout: int
+    retries: int
+
+
+@lru_cache(maxsize=1)
+def _load_mqtt_config() -> _MqttConfig:
+    """Parse the MQTT env vars once (same names/defaults as alert-monitor.sh)"""
+    return _MqttConfig(
+        host=env_str("MQTT_HOST", "18.100.207.236"),
+        port=int(env_str("MQTT_PORT", "1883")),
+        user=env_str("MQTT_USER", "storeyes"),
+        password=env_str("MQTT_PASS", "12345"),
+        topic_override=env_str("MQTT_TOPIC"),
+        qos=int(env_str("QOS", "1")),
+        retain=env_str("RETAIN", "false").lower() == "true",
+        timeout=int(env_str("TIMEOUT", "5")),
+        retries=int(env_str("RETRIES", "3")),
+    )
+
+
+# One long-lived MQTT client amortizes the TCP + CONNECT handshake across
+# every status publish; paho's network loop reconnects on its own after a
+# broker drop and _mqtt_connected tracks whether publishing is currently safe
+_mqtt_client_lock = threading.Lock()
+_mqtt_client = None
+_mqtt_connected = threading.Event()
+
+
+def _mqtt_on_connect(client, userdata, flags, reason_code, properties=None):
+    get_logger(__name__).info(f"MQTT connect result: reason_code={reason_code}, flags={flags}")
+    _mqtt_connected.set()
+
+
+def _mqtt_on_disconnect(client, userdata, disconnect_flags, reason_code, properties=None):
+    _mqtt_connected.clear()
+    get_logger(__name__).warning(
+        f"MQTT disconnect: reason_code={reason_code}, flags={disconnect_flags}"
+    )
+
+
+def _mqtt_on_publish(client, userdata, mid, reason_code, properties=None):
+    get_logger(__name__).debug(
+        f"MQTT on_publish: mid={mid}, reason_code={reason_code}, properties={properties}"
+    )
+
+
+def _mqtt_on_log(client, userdata, level, buf):
+    # Mirror the debug logs you see in the Linux runtime (lazy formatting:
+    # paho fires this for every internal event)
+    get_logger(__name__).debug("MQTT log [%s]: %s", level, buf)
+
+
+def _get_mqtt_client(mqtt_host: str, mqtt_port: int, mqtt_user: str, mqtt_pass: str):
+    """Return the process-wide MQTT client, creating and connecting it once"""
+    global _mqtt_client
+    with _mqtt_client_lock:
+        if _mqtt_client is None:
+            logger = get_logger(__name__)
+            # Log the connection parameters once, at client creation
+            logger.info(f"MQTT client config: host={mqtt_host}, port={mqtt_port}, user={mqtt_user}")
+            # Use latest callback API version to avoid deprecation warning
+            client = mqtt.Client(callback_api_version=mqtt.CallbackAPIVersion.VERSION2)
+            client.username_pw_set(mqtt_user, mqtt_pass)
+            client.on_connect = _mqtt_on_connect
+            client.on_disconnect = _mqtt_on_disconnect
+            client.on_publish = _mqtt_on_publish
+            # paho invokes on_log for every internal event; only wire it up
+            # when DEBUG is actually enabled
+            if logger.isEnabledFor(logging.DEBUG):
+                client.on_log = _mqtt_on_log
+            # connect_async + loop_start: the network thread owns the
+            # connection and transparently re-establishes it after drops
+            client.connect_async(mqtt_host, mqtt_port, keepalive=60)
+            client.loop_start()
+            _mqtt_client = client
+        return _mqtt_client
+
+
+def _shutdown_mqtt():
+    with _mqtt_client_lock:
+        client = _mqtt_client
+    if client is not None:
+        try:
+            client.loop_stop()
+            client.disconnect()
+        except Exception:
+            pass
+
+
+# Registered before the status-queue join below, so at exit the last queued
+# status is published first and the client is torn down after (atexit is LIFO)
+atexit.register(_shutdown_mqtt)
+
+
+def _publish_mqtt_status(board_id: str, status: str, total_count: Optional[int] = None,
                          processed_count: Optional[int] = None) -> bool:
     """
     Publish status to MQTT broker
@@ -60,21 +217,17 @@ def _publish_mqtt_status(board_id: str, status: str, total_count: Optional[int]
         True if published successfully, False otherwise
     """
     logger = get_logger(__name__)
-    
-    # MQTT configuration (same as alert-monitor.sh)
-    mqtt_host = os.environ.get("MQTT_HOST", "18.100.207.236")
-    mqtt_port = os.environ.get("MQTT_PORT", "1883")
-    mqtt_user = os.environ.get("MQTT_USER", "storeyes")
-    mqtt_pass = os.environ.get("MQTT_PASS", "12345")
-    mqtt_topic = os.environ.get("MQTT_TOPIC", f"storeyes/{board_id}/alert-processor")
-    qos = os.environ.get("QOS", "1")
-    retain = os.environ.get("RETAIN", "false").lower() == "true"
-    timeout = int(os.environ.get("TIMEOUT", "5"))
-    retries = int(os.environ.get("RETRIES", "3"))
-    
+
+    # MQTT configuration, parsed from the environment once; only the topic
+    # default depends on the board_id
+    cfg = _load_mqtt_config()
+    mqtt_topic = cfg.topic_override or f"storeyes/{board_id}/alert-processor"
+    timeout = cfg.timeout
+    retries = cfg.retries
+
     # Build JSON payload (same format as alert-monitor.sh)
-    timestamp = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
-    
+    timestamp = _utc_iso_now()
+
     payload = {
         "board_id": board_id,
         "timestamp": timestamp,
@@ -85,82 +238,49 @@ def _publish_mqtt_status(board_id: str, status: str, total_count: Optional[int]
         }
     }
     
-    # Convert to compact JSON
+    # Convert to compact JSON bytes (paho publishes bytes without re-encoding)
     try:
-        json_payload = json.dumps(payload, separators=(',', ':'))
+        json_payload = _json_dumps(payload)
     except Exception as e:
         logger.error(f"Failed to serialize MQTT payload: {e}", exc_info=True)
         return False
     
-    # Convert QOS to int
-    qos_int = int(qos)
-
-    # Callback API v2 callbacks for detailed logging and compatibility with paho-mqtt >= 2.0
-    def on_connect(client, userdata, flags, reason_code, properties=None):
-        logger.info(f"MQTT connect result: reason_code={reason_code}, flags={flags}")
-
-    def on_disconnect(client, userdata, disconnect_flags, reason_code, properties=None):
-        logger.warning(
-            f"MQTT disconnect: reason_code={reason_code}, flags={disconnect_flags}"
-        )
+    # Terminal states need at-least-once delivery; intermediate progress
+    # pings are transient, so QoS 0 skips the broker ack round trip
+    durable = status in _TERMINAL_STATUSES
+    qos = cfg.qos if durable else 0
 
-    def on_publish(client, userdata, mid, reason_code, properties=None):
-        logger.debug(
-            f"MQTT on_publish: mid={mid}, reason_code={reason_code}, properties={properties}"
-        )
-
-    def on_log(client, userdata, level, buf):
-        # Mirror the debug logs you see in the Linux runtime
-        logger.debug(f"MQTT log [{level}]: {buf}")
-
-    # Retry loop (same as alert-monitor.sh)
-    client = None
+    # Retry loop (same semantics as alert-monitor.sh), reusing one client:
+    # only the first call pays the TCP + MQTT CONNECT handshake
+    client = _get_mqtt_client(cfg.host, cfg.port, cfg.user, cfg.password)
     for attempt in range(1, retries + 1):
         try:
-            logger.info(
-                f"MQTT publish config: host={mqtt_host}, port={mqtt_port}, "
-                f"user={mqtt_user}, topic={mqtt_topic}, qos={qos_int}, "
-                f"timeout={timeout}, retries={retries}"
-            )
-            logger.debug(
-                f"Connecting to MQTT broker {mqtt_host}:{mqtt_port} (attempt {attempt}/{retries})"
-            )
-
-            # Create MQTT client (use latest callback API version to avoid deprecation warning)
-            client = mqtt.Client(callback_api_version=mqtt.CallbackAPIVersion.VERSION2)
-            client.username_pw_set(mqtt_user, mqtt_pass)
-            client.on_connect = on_connect
-            client.on_disconnect = on_disconnect
-            client.on_publish = on_publish
-            client.on_log = on_log
-
-            # Connect to broker
-            client.connect(mqtt_host, int(mqtt_port), keepalive=60)
-
-            # Start network loop to handle connection
-            client.loop_start()
-
-            # Wait a bit for connection to establish
-            time.sleep(0.1)
+            # Give the network thread a chance to (re)connect before queueing
+            if not _mqtt_connected.wait(timeout=timeout):
+                logger.warning(
+                    f"MQTT broker not connected after {timeout}s (attempt {attempt}/{retries})"
+                )
 
             # Publish message
             result = client.publish(
                 mqtt_topic,
                 json_payload,
-                qos=qos_int,
-                retain=retain
+                qos=qos,
+                retain=cfg.retain
             )
             logger.debug(
                 f"MQTT publish invoked, mid={result.mid}, rc={result.rc}"
             )
 
+            # Fire-and-forget for progress pings: at QoS 0 there is no ack
+            # to wait for, the network thread sends it when it can
+            if not durable:
+                return True
+
             # Wait for message to be published, then check publish state explicitly.
             result.wait_for_publish(timeout=timeout)
 
             if result.is_published():
-                # Stop network loop
-                client.loop_stop()
-                client.disconnect()
                 logger.debug(
                     f"MQTT status published successfully (attempt {attempt}/{retries})"
                 )
@@ -170,8 +290,6 @@ def _publish_mqtt_status(board_id: str, status: str, total_count: Optional[int]
                     f"MQTT publish timeout (attempt {attempt}/{retries}), "
                     f"mid={result.mid}, rc={result.rc}"
                 )
-                client.loop_stop()
-                client.disconnect()
 
         except Exception as e:
             # Log full stack trace so that with --verbose you can see exactly why publish failed,
@@ -180,47 +298,64 @@ def _publish_mqtt_status(board_id: str, status: str, total_count: Optional[int]
                 f"MQTT publish error (attempt {attempt}/{retries}): {e}",
                 exc_info=True,
             )
-            if client:
-                try:
-                    client.loop_stop()
-                    client.disconnect()
-                except Exception:
-                    pass
             # Do not swallow the exception – propagate it so the caller sees the real cause.
             raise
 
         if attempt < retries:
-            time.sleep(2)
-    
+            # Exponential backoff with jitter: transient blips retry after
+            # ~100ms instead of a flat 2s, and a fleet of processors does
+            # not hammer a recovering broker in lockstep
+            time.sleep(min(0.1 * (2 ** (attempt - 1)), 2.0) + random.uniform(0, 0.1))
+
     logger.error(f"Failed to publish MQTT status after {retries} attempts")
     return False
 
 
-def write_status_file(status, total_count=None, processed_count=None, board_id: Optional[str] = None):
-    """
-    Write status file and publish to MQTT
-    
-    Args:
-        status: Status string (EMPTY, PROCESSING, MF_PROCESSING, FINISHED)
-        total_count: Total number of alerts (optional)
-        processed_count: Number of processed alerts (optional)
-        board_id: Device/board ID for MQTT (optional, will try to get from device_utils if not provided)
-    """
+# Last payload that reached disk; identical rewrites are skipped entirely
+_last_status_payload = None
+
+
+def _write_status_once(status, total_count=None, processed_count=None, board_id: Optional[str] = None,
+                       publish_mqtt: bool = True):
+    """Perform one status-file write plus MQTT publish (runs on the writer thread)"""
+    global _last_status_payload
     logger = get_logger(__name__)
-    
-    # Write to file (for backward compatibility and read_status_file)
+
+    # Write to file (for backward compatibility and read_status_file).
+    # Single buffered write to a temp file + atomic rename so readers and
+    # crashes never observe a torn status.
     status_file = get_status_file_path()
+    parts = [status]
+    if total_count is not None:
+        parts.append(str(total_count))
+    if processed_count is not None:
+        parts.append(str(processed_count))
+    data = ('\n'.join(parts) + '\n').encode('utf-8')
+    tmp_file = status_file.with_suffix(".tmp")
     try:
-        with open(status_file, 'w', encoding='utf-8') as f:
-            f.write(f"{status}\n")
-            if total_count is not None:
-                f.write(f"{total_count}\n")
-            if processed_count is not None:
-                f.write(f"{processed_count}\n")
+        with _status_write_lock:
+            # Bit-identical payloads are no-ops; terminal FINISHED always
+            # lands so a stale file can never mask a completed run
+            if data == _last_status_payload and status != "FINISHED":
+                return
+            # One write(2) of the preformatted bytes
+            fd = os.open(tmp_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+            try:
+                os.write(fd, data)
+                # Only the terminal state is worth a durability barrier;
+                # intermediate progress is rewritten moments later anyway
+                if status == "FINISHED":
+                    os.fsync(fd)
+            finally:
+                os.close(fd)
+            os.replace(tmp_file, status_file)
+            _last_status_payload = data
     except Exception as e:
         logger.error(f"Failed to write status file: {e}", exc_info=True)
     
     # Publish to MQTT
+    if not publish_mqtt:
+        return
     if board_id is None:
         # Try to get board_id from device_utils
         try:
@@ -236,3 +371,58 @@ def write_status_file(status, total_count=None, processed_count=None, board_id:
     # so they are visible in logs and not hidden behind generic warnings.
     _publish_mqtt_status(board_id, status, total_count, processed_count)
 
+
+# Status updates are coalesced through a single-slot queue drained by one
+# daemon thread: completion handlers never block on disk or the broker, and a
+# burst of progress updates collapses to the most recent one
+_status_queue: "queue.Queue" = queue.Queue(maxsize=1)
+
+
+def _drain_status_queue():
+    logger = get_logger(__name__)
+    while True:
+        item = _status_queue.get()
+        try:
+            _write_status_once(*item)
+        except Exception as e:
+            logger.error(f"Background status write failed: {e}", exc_info=True)
+        finally:
+            _status_queue.task_done()
+
+
+_status_writer = threading.Thread(target=_drain_status_queue, name="status-writer", daemon=True)
+_status_writer.start()
+
+# Make sure the last queued status (e.g. FINISHED) is written before exit
+atexit.register(_status_queue.join)
+
+
+def write_status_file(status, total_count=None, processed_count=None, board_id: Optional[str] = None,
+                      publish_mqtt: bool = True):
+    """
+    Queue a status update for the background writer
+
+    Args:
+        status: Status string (EMPTY, PROCESSING, MF_PROCESSING, FINISHED)
+        total_count: Total number of alerts (optional)
+        processed_count: Number of processed alerts (optional)
+        board_id: Device/board ID for MQTT (optional, will try to get from device_utils if not provided)
+        publish_mqtt: Set False to update only the local file and skip the broker
+
+    Returns immediately; if an update is already pending it is replaced by
+    this newer one, so intermediate progress values may be skipped on disk
+    and over MQTT.
+    """
+    item = (status, total_count, processed_count, board_id, publish_mqtt)
+    while True:
+        try:
+            _status_queue.put_nowait(item)
+            return
+        except queue.Full:
+            # Drop the stale pending update in favour of this one
+            try:
+                _status_queue.get_nowait()
+                _status_queue.task_done()
+            except queue.Empty:
+                pass
+
@@ -2,7 +2,26 @@ import subprocess
 import os
 import shutil
 import platform
-from typing import List
+from functools import lru_cache
+from typing import List, Optional
+
+
+@lru_cache(maxsize=None)
+def ffmpeg_path() -> Optional[str]:
+    """
+    Absolute path to ffmpeg, resolved once.
+
+    shutil.which walks every $PATH entry with access checks; the binary's
+    location doesn't change at runtime, and the absolute path also lets the
+    kernel skip its own execvp PATH search.
+    """
+    return shutil.which("ffmpeg")
+
+
+@lru_cache(maxsize=None)
+def ffprobe_path() -> Optional[str]:
+    """Absolute path to ffprobe, resolved once (see ffmpeg_path)."""
+    return shutil.which("ffprobe")
 
 
 def ffmpeg_global_thread_args() -> List[str]:
@@ -28,6 +47,14 @@ def ffmpeg_global_thread_args() -> List[str]:
     return ["-threads", "1"]
 
 
+def _remove_if_exists(path: str) -> None:
+    """Delete a file, tolerating its absence (no stat pre-check, no TOCTOU)"""
+    try:
+        os.unlink(path)
+    except FileNotFoundError:
+        pass
+
+
 def should_run_browser_reencode() -> bool:
     """
     Heavy libx264 re-encode + faststart is opt-in (off by default).
@@ -68,7 +95,8 @@ def ensure_browser_playable_mp4(video_path: str, quiet: bool = False) -> None:
         raise FileNotFoundError(f"Video file not found: {video_path}")
 
     # Check if ffmpeg is available
-    if not shutil.which("ffmpeg"):
+    ffmpeg = ffmpeg_path()
+    if not ffmpeg:
         if not quiet:
             print("⚠️  ffmpeg not found in PATH. Skipping browser optimization.")
             print("   Install ffmpeg: https://ffmpeg.org/download.html")
@@ -81,9 +109,15 @@ def ensure_browser_playable_mp4(video_path: str, quiet: bool = False) -> None:
 
     try:
         cmd = [
-            "ffmpeg",
+            ffmpeg,
+            "-hide_banner",
+            "-nostats",
+            *(["-loglevel", "error"] if quiet else []),
             "-y",
             *ffmpeg_global_thread_args(),
+            # The input is a clip this pipeline just wrote; naming the
+            # demuxer skips ffmpeg's format probing on startup
+            "-f", "mp4",
             "-i", video_path,
             "-c:v", "libx264",
             "-preset", _libx264_preset(),
@@ -94,31 +128,37 @@ def ensure_browser_playable_mp4(video_path: str, quiet: bool = False) -> None:
             temp_output,
         ]
 
+        # close_fds=False enables CPython's posix_spawn fast path (no fork
+        # page-table copy); Python-created fds are CLOEXEC anyway (PEP 446)
         if quiet:
-            # Suppress ffmpeg output
+            # -loglevel error leaves only real errors on stderr; capture
+            # them so a failure is diagnosable instead of discarded
             subprocess.run(
                 cmd,
-                stdout=subprocess.DEVNULL,
-                stderr=subprocess.DEVNULL,
-                check=True
+                capture_output=True,
+                text=True,
+                check=True,
+                close_fds=False,
             )
         else:
-            subprocess.run(cmd, check=True)
+            subprocess.run(cmd, check=True, close_fds=False)
 
-        # Replace original file with optimized version
-        if os.path.exists(temp_output):
+        # Replace original file with optimized version; a missing temp file
+        # means ffmpeg produced nothing despite exiting 0
+        try:
             os.replace(temp_output, video_path)
+        except FileNotFoundError:
             if not quiet:
-                print(f"✅ Video optimized for browser playback: {os.path.basename(video_path)}")
+                print("⚠️  ffmpeg produced no output file. Keeping original video.")
+            return
+        if not quiet:
+            print(f"✅ Video optimized for browser playback: {os.path.basename(video_path)}")
 
     except subprocess.CalledProcessError as e:
-        # Clean up temp file if it exists
-        if os.path.exists(temp_output):
-            os.remove(temp_output)
-        raise Exception(f"ffmpeg conversion failed: {e}") from e
-
-    except Exception as e:
-        # Clean up temp file if it exists
-        if os.path.exists(temp_output):
-            os.remove(temp_output)
+        _remove_if_exists(temp_output)
+        detail = f": {e.stderr.strip()}" if e.stderr else ""
+        raise Exception(f"ffmpeg conversion failed: {e}{detail}") from e
+
+    except Exception:
+        _remove_if_exists(temp_output)
         raise